@@ -15,14 +15,15 @@
 uint32_t ce_hash_calculate(const char* str)
 {
     uint32_t hash = DJB2_INIT_HASH;
-    char c = '\0';
+    unsigned char c = 0u;
 
     if (NULL == str)
     {
         return 0u;
     }
 
-    while ((c = *str++) != '\0')
+    /* Read bytes as unsigned so non-ASCII (UTF-8) input hashes like the generator */
+    while ((c = (unsigned char)*str++) != 0u)
     {
         /* Equivalent to hash * 33 + c */
         hash = ((hash << DJB2_HASH_SHIFT) + hash) + (uint32_t)c;
@@ -20,7 +20,8 @@ extern "C" {
  * into consistent 32-bit hash values at runtime.
  *
  * It is compatible with the same hashing logic implemented in Python
- * for command IDs generation during build time.
+ * for command IDs generation during build time: every byte of the
+ * string is taken as an unsigned value, so UTF-8 input matches too.
  *
  * @param str Null-terminated input string to hash
  * @return Unsigned 32-bit hash result
@@ -0,0 +1,219 @@
+/* SPDX-License-Identifier: Apache-2.0 */
+/**
+ * @file _djb2.c
+ * @brief Optional CPython extension computing the 32-bit DJB2 command hash.
+ *
+ * Native counterpart of `utils.djb2_hash()`, producing the same values as
+ * `ce_hash_calculate()` on the target. The generator falls back to the
+ * pure-Python implementation when this module is not built.
+ */
+
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+#include <stdint.h>
+
+/* DJB2 hash constants (kept in sync with src/ce_hash.c) */
+#define DJB2_INIT_HASH        (5381u)
+#define DJB2_HASH_SHIFT       (5u)
+#define DJB2_BLOCK_SIZE       (8)
+#define DJB2_CACHE_LINE       (64)
+
+/* Read prefetch with no temporal locality; a no-op on compilers without the builtin */
+#if defined(__GNUC__) || defined(__clang__)
+#define DJB2_PREFETCH(addr)   __builtin_prefetch((addr), 0, 0)
+#else
+#define DJB2_PREFETCH(addr)   ((void)(addr))
+#endif
+
+/**
+ * Powers of 33 modulo 2^32. Folding a block of 8 bytes as
+ * hash * 33^8 + c0 * 33^7 + ... + c7 gives the same result as eight serial
+ * steps, but the eight products are independent and can issue in parallel.
+ */
+static const uint32_t djb2_pow33_au32[DJB2_BLOCK_SIZE + 1] = {
+    0x00000001u, 0x00000021u, 0x00000441u, 0x00008C61u, 0x00121881u,
+    0x025528A1u, 0x4CFA3CC1u, 0xEC41D4E1u, 0x747C7101u
+};
+
+/**
+ * @brief Hash a byte buffer with DJB2.
+ *
+ * @param data_u8p  Bytes to hash.
+ * @param len       Number of bytes.
+ * @return Unsigned 32-bit hash.
+ */
+static uint32_t djb2_bytes(const uint8_t *data_u8p, Py_ssize_t len)
+{
+    Py_ssize_t i = 0;
+    uint32_t hash = DJB2_INIT_HASH;
+
+    /* Start loading the first two cache lines of a possibly cold string */
+    DJB2_PREFETCH(data_u8p);
+    if (len > DJB2_CACHE_LINE)
+    {
+        DJB2_PREFETCH(data_u8p + DJB2_CACHE_LINE);
+    }
+
+    /* Main loop: whole 8-byte blocks */
+    for (; i + DJB2_BLOCK_SIZE <= len; i += DJB2_BLOCK_SIZE)
+    {
+        const uint8_t *b_u8p = data_u8p + i;
+
+        hash = hash * djb2_pow33_au32[8]
+             + (uint32_t)b_u8p[0] * djb2_pow33_au32[7] + (uint32_t)b_u8p[1] * djb2_pow33_au32[6]
+             + (uint32_t)b_u8p[2] * djb2_pow33_au32[5] + (uint32_t)b_u8p[3] * djb2_pow33_au32[4]
+             + (uint32_t)b_u8p[4] * djb2_pow33_au32[3] + (uint32_t)b_u8p[5] * djb2_pow33_au32[2]
+             + (uint32_t)b_u8p[6] * djb2_pow33_au32[1] + (uint32_t)b_u8p[7];
+    }
+
+    /* Tail: remaining 0..7 bytes */
+    for (; i < len; ++i)
+    {
+        /* Equivalent to hash * 33 + c */
+        hash = ((hash << DJB2_HASH_SHIFT) + hash) + (uint32_t)data_u8p[i];
+    }
+
+    return hash;
+}
+
+/**
+ * @brief Hash the UTF-8 encoding of a str object with DJB2.
+ *
+ * @param arg       String to hash.
+ * @param hash_pu32 Receives the hash on success.
+ * @return 0 on success, -1 with a Python exception set on error.
+ */
+static int djb2_str(PyObject *arg, uint32_t *hash_pu32)
+{
+    const uint8_t *data_u8p;
+    Py_ssize_t len;
+
+    if (!PyUnicode_Check(arg))
+    {
+        PyErr_Format(PyExc_TypeError, "djb2() argument must be str, not %.200s",
+                     Py_TYPE(arg)->tp_name);
+        return -1;
+    }
+
+#if PY_VERSION_HEX < 0x030C0000
+    if (PyUnicode_READY(arg) < 0)
+    {
+        return -1;
+    }
+#endif
+
+    if (PyUnicode_IS_ASCII(arg))
+    {
+        /* ASCII text is stored one byte per character, identical to its UTF-8 encoding */
+        data_u8p = (const uint8_t *)PyUnicode_1BYTE_DATA(arg);
+        len = PyUnicode_GET_LENGTH(arg);
+    }
+    else
+    {
+        /* UTF-8 buffer is cached on the str object, so repeated calls do not re-encode */
+        data_u8p = (const uint8_t *)PyUnicode_AsUTF8AndSize(arg, &len);
+        if (data_u8p == NULL)
+        {
+            return -1;
+        }
+    }
+
+    *hash_pu32 = djb2_bytes(data_u8p, len);
+    return 0;
+}
+
+/**
+ * @brief Hash one str with DJB2.
+ *
+ * @param self  Module object (unused).
+ * @param arg   String to hash.
+ * @return Python int holding the unsigned 32-bit hash, or NULL on error.
+ */
+static PyObject *djb2(PyObject *self, PyObject *arg)
+{
+    uint32_t hash;
+
+    (void)self;
+
+    if (djb2_str(arg, &hash) < 0)
+    {
+        return NULL;
+    }
+    return PyLong_FromUnsignedLong((unsigned long)hash);
+}
+
+/**
+ * @brief Hash every str of an iterable with DJB2 in a single call.
+ *
+ * Avoids one Python-level call per name when hashing a whole command set.
+ *
+ * @param self  Module object (unused).
+ * @param arg   Iterable of strings.
+ * @return List of unsigned 32-bit hashes in input order, or NULL on error.
+ */
+static PyObject *djb2_many(PyObject *self, PyObject *arg)
+{
+    PyObject *seq;
+    PyObject *result;
+    Py_ssize_t count;
+    uint32_t hash;
+
+    (void)self;
+
+    seq = PySequence_Fast(arg, "djb2_many() argument must be iterable");
+    if (seq == NULL)
+    {
+        return NULL;
+    }
+
+    count = PySequence_Fast_GET_SIZE(seq);
+    result = PyList_New(count);
+    if (result == NULL)
+    {
+        Py_DECREF(seq);
+        return NULL;
+    }
+
+    for (Py_ssize_t i = 0; i < count; ++i)
+    {
+        PyObject *value;
+
+        if (djb2_str(PySequence_Fast_GET_ITEM(seq, i), &hash) < 0)
+        {
+            Py_DECREF(result);
+            Py_DECREF(seq);
+            return NULL;
+        }
+
+        value = PyLong_FromUnsignedLong((unsigned long)hash);
+        if (value == NULL)
+        {
+            Py_DECREF(result);
+            Py_DECREF(seq);
+            return NULL;
+        }
+        PyList_SET_ITEM(result, i, value);
+    }
+
+    Py_DECREF(seq);
+    return result;
+}
+
+static PyMethodDef djb2_methods[] = {
+    {"djb2", djb2, METH_O, "Return the 32-bit DJB2 hash of the UTF-8 encoding of a str."},
+    {"djb2_many", djb2_many, METH_O, "Return the DJB2 hashes of an iterable of str as a list."},
+    {NULL, NULL, 0, NULL}
+};
+
+static struct PyModuleDef djb2_module = {
+    PyModuleDef_HEAD_INIT,
+    "_djb2",
+    "Native DJB2 hashing for the YAML-to-C generator.",
+    -1,
+    djb2_methods
+};
+
+PyMODINIT_FUNC PyInit__djb2(void)
+{
+    return PyModule_Create(&djb2_module);
+}
@@ -36,7 +36,7 @@ if ! pip install --upgrade pip >/dev/null 2>&1; then
 fi
 
 # Step 4: Ensure key packages are installed
-REQUIRED_PKGS=(ruamel.yaml pytest black ruff flake8)
+REQUIRED_PKGS=(pyyaml pytest black ruff flake8)
 for pkg in "${REQUIRED_PKGS[@]}"; do
   if ! pip show "$pkg" &>/dev/null; then
     echo "📦 Installing $pkg..."
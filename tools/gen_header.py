@@ -3,8 +3,29 @@
 Header generator from YAML command definitions.
 """
 
+import io
 from pathlib import Path
-from utils import djb2_hash
+from utils import batch_djb2, memoize_render, WRITE_BUFFER_SIZE
+
+# File preamble; only the file name and include guard vary between renders
+_HEADER_TEMPLATE = """\
+/* SPDX-License-Identifier: Apache-2.0 */
+/**
+ * @file {filename}
+ * @brief Auto-generated command ID definitions based on YAML configuration.
+ *
+ * This header defines unique 32-bit hashes for each command supported by the
+ * Command Engine. These hashes are used internally for efficient command
+ * identification and dispatch.
+ *
+ * @note This file is auto-generated. Do not modify manually as changes
+ *       will be overwritten by the code generator.
+ */
+
+#ifndef {guard}
+#define {guard}
+
+"""
 
 
 class HeaderGenerator:
@@ -12,73 +33,48 @@ class HeaderGenerator:
     Generate the output C header file defining command hash macros.
     """
 
-    def __init__(self, commands):
+    def __init__(self, commands, hashes=None):
         self.commands = commands
+        self.hashes = hashes if hashes is not None else batch_djb2(c["name"] for c in commands)
 
-    def render(self, filename: str) -> str:
+    @memoize_render
+    def render(self, filename: str, stream=None):
         """
         Produce the contents of the header as a string.
 
         Args:
             filename: File name used for include guard.
+            stream: Optional text stream to write the header into.
 
         Returns:
-            A string representing the header content.
+            A string representing the header content, or None if `stream` is given.
         """
-        guard = Path(filename).stem.upper() + "_H"
-        lines = [
-            "/* SPDX-License-Identifier: Apache-2.0 */",
-            "/**",
-            f" * @file {Path(filename).name}",
-            " * @brief Auto-generated command ID definitions based on YAML configuration.",
-            " *",
-            " * This header defines unique 32-bit hashes for each command supported by the",
-            " * Command Engine. These hashes are used internally for efficient command",
-            " * identification and dispatch.",
-            " *",
-            " * @note This file is auto-generated. Do not modify manually as changes",
-            " *       will be overwritten by the code generator.",
-            " */",
-            "",
-            f"#ifndef {guard}",
-            f"#define {guard}",
-            "",
-        ]
+        path = Path(filename)
+        guard = path.stem.upper() + "_H"
+        buf = io.StringIO() if stream is None else stream
+        w = buf.write
+        w(_HEADER_TEMPLATE.format(filename=path.name, guard=guard))
 
-        lines += self._prepare_enum()
-        lines.append(f"#endif /* {guard} */\n")
-        return "\n".join(lines)
+        self._prepare_enum(w)
+        w(f"#endif /* {guard} */\n")
+        return buf.getvalue() if stream is None else None
 
-    def _prepare_enum(self):
+    def _prepare_enum(self, w):
         """
         Generate a strongly-typed enum of command hashes.
 
-        Returns:
-            A list of strings representing enum lines.
+        Args:
+            w: Write callable of the output buffer.
         """
-        enum_lines = ["typedef enum {"]
+        w("typedef enum {\n")
         for cmd in self.commands:
             enum_name = f"CE_CMD_{cmd['name'].upper()}_e"
-            value = djb2_hash(cmd["name"])
-            enum_lines.append(f"    {enum_name:<32} = 0x{value:08X}u,")
-        enum_lines.append("} ce_cmd_hash_et;\n")
-        return enum_lines
-
-    def _prepare_macros(self):
-        """
-        [DEPRECATED] Generate legacy hash macros.
-
-        This function is retained for reference or fallback compatibility,
-        but not used in current output (enums are preferred).
-        """
-        lines = []
-        for cmd in self.commands:
-            macro = f"CE_HASH_CMD_{cmd['name'].upper()}"
-            value = djb2_hash(cmd["name"])
-            lines.append(f"#define {macro:<32} 0x{value:08X}u")
-        return lines
+            value = self.hashes[cmd["name"]]
+            w(f"    {enum_name:<32} = 0x{value:08X}u,\n")
+        w("} ce_cmd_hash_et;\n\n")
 
     def write_to(self, path: Path):
         """Write the header content to the specified path."""
         path.parent.mkdir(parents=True, exist_ok=True)
-        path.write_text(self.render(path.name), encoding="utf-8")
+        with path.open("w", encoding="utf-8", buffering=WRITE_BUFFER_SIZE) as f:
+            self.render(path.name, stream=f)
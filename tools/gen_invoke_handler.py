@@ -3,8 +3,117 @@
 Invoke handler generator from YAML command definitions.
 """
 
+import io
 from pathlib import Path
-from utils import TYPE_MAP
+from utils import (
+    batch_djb2,
+    build_perfect_hash,
+    memoize_render,
+    perfect_hash_index,
+    resolve_arg_types,
+    PHF_MULTIPLIER,
+    WRITE_BUFFER_SIZE,
+)
+
+# From this many commands on, dispatch through a perfect-hash index instead of
+# switching on sparse 32-bit hashes
+PERFECT_HASH_MIN_COMMANDS = 32
+
+# File preamble; only the file name varies between renders
+_HEADER_TEMPLATE = """\
+/* SPDX-License-Identifier: Apache-2.0 */
+/**
+ * @file {filename}
+ * @brief Auto-generated command invocation handler from YAML definitions.
+ *
+ * This source file implements the `invoke_handler()` function, which
+ * dispatches commands to their respective handler functions based on
+ * command hash values and associated argument type information.
+ *
+ * @note This file is auto-generated. Do not modify manually as changes
+ *       will be overwritten by the code generator.
+ */
+
+#include <stdint.h>
+#include <stdio.h>
+#include "ce_types.h"
+#include "ce_command_ids.h"
+
+"""
+
+# Dispatcher prologue up to the function body
+_FUNC_OPEN = """
+bool ce_invoke_handler(const ce_signature_st *sig_pst,
+                       const ce_arg_value_ut args_a[MAX_TOKENS])
+{
+"""
+
+# Switch on the command hash enum (small command sets)
+_SWITCH_ON_HASH = """\
+    switch ((ce_cmd_hash_et)sig_pst->hash_u32)
+    {
+"""
+
+# Perfect-hash lookup; mirrors utils.phf_mix() and utils.perfect_hash_index()
+_PHF_LOOKUP = """
+static uint32_t ce_phf_mix(uint32_t hash_u32, uint32_t seed_u32)
+{
+    uint32_t value_u32 = (hash_u32 ^ seed_u32) * 0x%08Xu;
+    return value_u32 ^ (value_u32 >> 16);
+}
+
+static uint32_t ce_phf_index(uint32_t hash_u32)
+{
+    int32_t seed_i32 = ce_phf_seeds_ai32[ce_phf_mix(hash_u32, 0u) %% CE_PHF_SIZE];
+
+    if (seed_i32 < 0)
+    {
+        return (uint32_t)(-(seed_i32 + 1));
+    }
+    return ce_phf_mix(hash_u32, (uint32_t)seed_i32) %% CE_PHF_SIZE;
+}
+"""
+
+# Per-command call stub; the body comes from InvokeGenerator._write_call()
+_STUB_OPEN = """
+static bool ce_call_%s(const ce_signature_st *sig_pst,
+%s const ce_arg_value_ut args_a[MAX_TOKENS])
+{
+"""
+
+# Dispatch table type, indexed by the perfect-hash slot of each command
+_DISPATCH_TYPEDEF = """
+typedef bool (*ce_dispatch_fn_t)(const ce_signature_st *sig_pst,
+                                 const ce_arg_value_ut args_a[MAX_TOKENS]);
+
+static const ce_dispatch_fn_t ce_dispatch_table_apf[CE_PHF_SIZE] = {
+"""
+
+# Look up the perfect-hash slot, confirm the hash matches, and call its stub
+_DISPATCH_BY_INDEX = """\
+    const uint32_t hash_u32 = sig_pst->hash_u32;
+    const uint32_t index_u32 = ce_phf_index(hash_u32);
+
+    if (ce_phf_hashes_au32[index_u32] != hash_u32)
+    {
+        return false;
+    }
+
+    return ce_dispatch_table_apf[index_u32](sig_pst, args_a);
+}
+"""
+
+# One handler argument: (indent, C type, index, index). ARGVAL() yields a
+# uintptr_t, which converts directly to both scalar and pointer argument types.
+_ARG_FMT = "%s(%s)ARGVAL(sig_pst->types_e[%d], args_a[%d])"
+
+# Default case for unknown commands
+_FUNC_CLOSE = """\
+        default:
+            return false;
+    }
+}
+"""
 
 
 class InvokeGenerator:
@@ -13,109 +122,132 @@ class InvokeGenerator:
 
     This function performs runtime dispatch of command handlers
     by switching on the command hash and invoking the handler
-    with the properly casted arguments.
+    with the properly casted arguments. Large command sets instead
+    look up a minimal perfect-hash index of the command hash and call
+    through a table of per-command stubs.
 
     It relies on `ARGVAL(type, value)` to extract argument values
     and cast them to their correct types for the handler call.
     """
 
-    def __init__(self, commands, includes):
+    def __init__(self, commands, includes, hashes=None):
         """
         Initialize the generator.
 
         Args:
             commands (list): List of command dictionaries parsed from YAML.
             includes (list): List of additional header files to include.
+            hashes (dict, optional): Command name -> DJB2 hash map from the parser.
         """
         self.commands = commands
         self.includes = includes
+        self.hashes = hashes if hashes is not None else batch_djb2(c["name"] for c in commands)
 
-    def render(self, filename: str) -> str:
+    @memoize_render
+    def render(self, filename: str, stream=None):
         """
         Render the full C source for the invoke_handler file.
 
         Args:
             filename (str): File name for documentation comments.
+            stream (TextIO, optional): Text stream to write the source into.
 
         Returns:
-            str: Full contents of the generated C source.
+            str: Full contents of the generated C source, or None if `stream` is given.
         """
-        lines = [
-            "/* SPDX-License-Identifier: Apache-2.0 */",
-            "/**",
-            f" * @file {Path(filename).name}",
-            " * @brief Auto-generated command invocation handler from YAML definitions.",
-            " *",
-            " * This source file implements the `invoke_handler()` function, which",
-            " * dispatches commands to their respective handler functions based on",
-            " * command hash values and associated argument type information.",
-            " *",
-            " * @note This file is auto-generated. Do not modify manually as changes",
-            " *       will be overwritten by the code generator.",
-            " */",
-            "",
-            "#include <stdint.h>",
-            "#include <stdio.h>",
-            '#include "ce_types.h"',
-            '#include "ce_command_ids.h"',
-            "",
-        ]
+        buf = io.StringIO() if stream is None else stream
+        w = buf.write
+        w(_HEADER_TEMPLATE.format(filename=Path(filename).name))
 
         # Add any additional includes from YAML
         for inc in self.includes:
-            lines.append(f'#include "{inc}"')
-
-        lines += [
-            "",
-            "bool ce_invoke_handler(const ce_signature_st *sig_pst,",
-            "                       const ce_arg_value_ut args_a[MAX_TOKENS])",
-            "{",
-            "    switch ((ce_cmd_hash_et)sig_pst->hash_u32)",
-            "    {",
-        ]
-
-        for cmd in self.commands:
-            name = cmd["name"]
-            args = cmd.get("args", [])
-
-            # Comment with the command name
-            lines.append(f"        case CE_CMD_{name.upper()}_e:")
-
-            # Determine C types from argument types
-            cast_types = [TYPE_MAP[arg["type"]][1] for arg in args]
-
-            # Generate the casted function pointer
-            if not cast_types:
-                # No args
-                lines.append("            return ((bool (*)(void))sig_pst->handler)();")
-            else:
-                # Signature: bool (*)(type1, type2, ...)
-                sig_cast = f"bool (*)({', '.join(cast_types)})"
-
-                lines.append(f"            return (({sig_cast})sig_pst->handler)(")
-
-                # Cast and extract each argument
-                arg_lines = []
-                for i, typ in enumerate(cast_types):
-                    val = f"ARGVAL(sig_pst->types_e[{i}], args_a[{i}])"
-                    if typ in ["const char *", "const uint8_t *"]:
-                        arg_lines.append(f"                ({typ})(uintptr_t){val}")
-                    else:
-                        arg_lines.append(f"                ({typ}){val}")
-
-                # Join all arguments
-                lines.append(",\n".join(arg_lines) + "\n            );")
-
-        # Default case for unknown commands
-        lines += [
-            "        default:",
-            "            return false;",
-            "    }",
-            "}",
-            "",
-        ]
-
-        return "\n".join(lines)
+            w(f'#include "{inc}"\n')
+
+        if len(self.commands) >= PERFECT_HASH_MIN_COMMANDS:
+            commands = self._write_perfect_hash(w)
+            for cmd in commands:
+                name = cmd["name"]
+                w(_STUB_OPEN % (name, " " * (len(name) + 20)))
+                if not resolve_arg_types(cmd)[1]:
+                    # Zero-argument handlers never read the argument array
+                    w("    (void)args_a;\n")
+                self._write_call(w, cmd, "    ")
+                w("}\n")
+            w(_DISPATCH_TYPEDEF)
+            for cmd in commands:
+                w(f"    ce_call_{cmd['name']},\n")
+            w("};\n")
+            w(_FUNC_OPEN)
+            w(_DISPATCH_BY_INDEX)
+        else:
+            w(_FUNC_OPEN)
+            w(_SWITCH_ON_HASH)
+            for cmd in self.commands:
+                # Comment with the command name
+                w(f"        case CE_CMD_{cmd['name'].upper()}_e:\n")
+                self._write_call(w, cmd, "            ")
+
+            # Default case for unknown commands
+            w(_FUNC_CLOSE)
+
+        return buf.getvalue() if stream is None else None
+
+    def _write_perfect_hash(self, w):
+        """
+        Emit the perfect-hash tables and lookup used to index commands.
+
+        Args:
+            w (Callable): Write callable of the output buffer.
+
+        Returns:
+            list: Commands ordered by their perfect-hash index.
+        """
+        hashes = [self.hashes[cmd["name"]] for cmd in self.commands]
+        seeds = build_perfect_hash(hashes)
+        commands = [None] * len(self.commands)
+        for cmd, hash_u32 in zip(self.commands, hashes):
+            commands[perfect_hash_index(hash_u32, seeds)] = cmd
+
+        w(f"\n#define CE_PHF_SIZE ({len(commands)}u)\n\n")
+        w("static const uint32_t ce_phf_hashes_au32[CE_PHF_SIZE] = {\n")
+        for cmd in commands:
+            w(f"    CE_CMD_{cmd['name'].upper()}_e,\n")
+        w("};\n\n")
+        w("static const int32_t ce_phf_seeds_ai32[CE_PHF_SIZE] = {\n")
+        for i in range(0, len(seeds), 16):
+            w(f"    {', '.join(str(seed) for seed in seeds[i:i + 16])},\n")
+        w("};\n")
+        w(_PHF_LOOKUP % PHF_MULTIPLIER)
+        return commands
+
+    @staticmethod
+    def _write_call(w, cmd, indent):
+        """
+        Emit the statement that casts the handler and calls it with its arguments.
+
+        Args:
+            w (Callable): Write callable of the output buffer.
+            cmd (dict): Command whose handler is invoked.
+            indent (str): Indentation of the return statement.
+        """
+        # Determine C types from argument types
+        _, cast_types = resolve_arg_types(cmd)
+
+        # Generate the casted function pointer
+        if not cast_types:
+            # No args
+            w(f"{indent}return ((bool (*)(void))sig_pst->handler)();\n")
+            return
+
+        # Signature: bool (*)(type1, type2, ...)
+        sig_cast = f"bool (*)({', '.join(cast_types)})"
+
+        w(f"{indent}return (({sig_cast})sig_pst->handler)(\n")
+
+        # Cast and extract each argument, then join them
+        arg_indent = indent + "    "
+        w(",\n".join(_ARG_FMT % (arg_indent, typ, i, i) for i, typ in enumerate(cast_types)))
+        w(f"\n{indent});\n")
 
     def write_to(self, path: Path):
         """
@@ -125,4 +257,5 @@ class InvokeGenerator:
             path (Path): Full path to the output .c file.
         """
         path.parent.mkdir(parents=True, exist_ok=True)
-        path.write_text(self.render(path.name), encoding="utf-8")
+        with path.open("w", encoding="utf-8", buffering=WRITE_BUFFER_SIZE) as f:
+            self.render(path.name, stream=f)
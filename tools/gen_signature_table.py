@@ -3,8 +3,73 @@
 Source code generators from YAML command definitions.
 """
 
+import io
 from pathlib import Path
-from utils import djb2_hash, TYPE_MAP
+from utils import batch_djb2, memoize_render, resolve_arg_types, WRITE_BUFFER_SIZE
+
+# File preamble; only the file name varies between renders
+_HEADER_TEMPLATE = """\
+/* SPDX-License-Identifier: Apache-2.0 */
+/**
+ * @file {filename}
+ * @brief Auto-generated dispatch table for command handlers.
+ *
+ * This file contains the command signature table generated from the
+ * YAML configuration. It defines command hashes, their associated
+ * handler functions, and argument type signatures.
+ *
+ * It also provides accessor functions to retrieve the command signatures
+ * at runtime.
+ *
+ * @note This file is auto-generated. Do not modify manually as changes
+ *       will be overwritten by the code generator.
+ */
+
+#include <stddef.h>
+#include <stdint.h>
+#include <stdbool.h>
+#include "ce_table.h"
+#include "ce_command_ids.h"
+
+"""
+
+# Compile-time handler signature check used by the CE_ASSERT_ARGS lines
+_ASSERT_MACRO = r"""
+/* Compile-time type checking for function signatures */
+#if defined(__GNUC__) || defined(__clang__)
+#define CE_ASSERT_ARGS(fn, ...)                  \
+    _Static_assert(__builtin_types_compatible_p( \
+        typeof(&(fn)), bool (*)(__VA_ARGS__)     \
+    ), "Signature mismatch: " #fn)
+#else
+#warning "CE_ASSERT_ARGS: function signature checks not available on this compiler!"
+#define CE_ASSERT_ARGS(fn, ...)
+#endif
+
+"""
+
+# One ce_signature_st initializer: (hash, handler, command name, argument count)
+_SIG_ENTRY = """\
+    {
+        .hash_u32 = 0x%08Xu,
+        .handler = (handler_func_t)%s,
+        .types_e = ce_args_%s_ae,
+        .type_count_u8 = %du
+    },
+"""
+
+# Table accessors declared in ce_table.h
+_ACCESSORS = """\
+const ce_signature_st* ce_table_get_signatures(void)
+{
+    return ce_signature_table_ast;
+}
+
+size_t ce_table_get_signatures_count(void)
+{
+    return sizeof(ce_signature_table_ast) / sizeof(ce_signature_table_ast[0]);
+}
+"""
 
 
 class SignatureTableGenerator:
@@ -12,96 +77,56 @@ class SignatureTableGenerator:
     Generate the output C source file for the dispatch table.
     """
 
-    def __init__(self, commands, includes):
+    def __init__(self, commands, includes, hashes=None):
         self.commands = commands
         self.includes = includes
+        self.hashes = hashes if hashes is not None else batch_djb2(c["name"] for c in commands)
 
-    def render(self, filename: str) -> str:
+    @memoize_render
+    def render(self, filename: str, stream=None):
         """
         Produce the contents of the source as a string.
 
         Args:
             filename: File name for documentation purposes.
+            stream: Optional text stream to write the source into.
 
         Returns:
-            The complete C source code as a single string.
+            The complete C source code as a single string, or None if `stream` is given.
         """
-        lines = [
-            "/* SPDX-License-Identifier: Apache-2.0 */",
-            "/**",
-            f" * @file {Path(filename).name}",
-            " * @brief Auto-generated dispatch table for command handlers.",
-            " *",
-            " * This file contains the command signature table generated from the",
-            " * YAML configuration. It defines command hashes, their associated",
-            " * handler functions, and argument type signatures.",
-            " *",
-            " * It also provides accessor functions to retrieve the command signatures",
-            " * at runtime.",
-            " *",
-            " * @note This file is auto-generated. Do not modify manually as changes",
-            " *       will be overwritten by the code generator.",
-            " */",
-            "",
-            "#include <stddef.h>",
-            "#include <stdint.h>",
-            "#include <stdbool.h>",
-            '#include "ce_table.h"',
-            '#include "ce_command_ids.h"',
-            "",
-        ]
-        lines.extend([f'#include "{inc}"' for inc in self.includes])
-        lines += [
-            "",
-            "/* Compile-time type checking for function signatures */",
-            "#if defined(__GNUC__) || defined(__clang__)",
-            "#define CE_ASSERT_ARGS(fn, ...)                  \\",
-            "    _Static_assert(__builtin_types_compatible_p( \\",
-            "        typeof(&(fn)), bool (*)(__VA_ARGS__)     \\",
-            '    ), "Signature mismatch: " #fn)',
-            "#else",
-            '#warning "CE_ASSERT_ARGS: function signature checks not available on this compiler!"',
-            "#define CE_ASSERT_ARGS(fn, ...)",
-            "#endif",
-            "",
-        ]
+        buf = io.StringIO() if stream is None else stream
+        w = buf.write
+        w(_HEADER_TEMPLATE.format(filename=Path(filename).name))
+        for inc in self.includes:
+            w(f'#include "{inc}"\n')
+        w(_ASSERT_MACRO)
 
         for cmd in self.commands:
-            types = [TYPE_MAP[arg["type"]][1] for arg in cmd.get("args", [])]
-            lines.append(f"CE_ASSERT_ARGS({cmd['handler']}, {', '.join(types) or 'void'});")
+            _, types = resolve_arg_types(cmd)
+            w(f"CE_ASSERT_ARGS({cmd['handler']}, {', '.join(types) or 'void'});\n")
 
-        lines.append("")
+        w("\n")
 
         for cmd in self.commands:
             name = cmd["name"]
-            enums = [TYPE_MAP[arg["type"]][0] for arg in cmd.get("args", [])]
-            lines.append(f"static const ce_arg_type_et ce_args_{name}_ae[] = {{")
-            lines.append(f"    {', '.join(enums)}") if enums else None
-            lines.append("};\n")
+            enums, _ = resolve_arg_types(cmd)
+            w(f"static const ce_arg_type_et ce_args_{name}_ae[] = {{\n")
+            if enums:
+                w(f"    {', '.join(enums)}\n")
+            w("};\n\n")
 
-        lines.append("static const ce_signature_st ce_signature_table_ast[] = {")
+        w("static const ce_signature_st ce_signature_table_ast[] = {\n")
+        hashes = self.hashes
         for cmd in self.commands:
-            lines.append("    {")
-            lines.append(f"        .hash_u32 = 0x{djb2_hash(cmd['name']):08X}u,")
-            lines.append(f"        .handler = (handler_func_t){cmd['handler']},")
-            lines.append(f"        .types_e = ce_args_{cmd['name']}_ae,")
-            lines.append(f"        .type_count_u8 = {len(cmd.get('args', []))}u")
-            lines.append("    },")
-        lines.append("};\n")
-
-        lines += [
-            "const ce_signature_st* ce_table_get_signatures(void)",
-            "{",
-            "    return ce_signature_table_ast;",
-            "}\n",
-            "size_t ce_table_get_signatures_count(void)",
-            "{",
-            "    return sizeof(ce_signature_table_ast) / sizeof(ce_signature_table_ast[0]);",
-            "}\n",
-        ]
-        return "\n".join(lines)
+            name = cmd["name"]
+            w(_SIG_ENTRY % (hashes[name], cmd["handler"], name, len(cmd.get("args", []))))
+        w("};\n\n")
+
+        w(_ACCESSORS)
+        return buf.getvalue() if stream is None else None
 
     def write_to(self, path: Path):
         """Write the source content to the specified path."""
         path.parent.mkdir(parents=True, exist_ok=True)
-        path.write_text(self.render(path.name), encoding="utf-8")
+        with path.open("w", encoding="utf-8", buffering=WRITE_BUFFER_SIZE) as f:
+            self.render(path.name, stream=f)
@@ -23,6 +23,10 @@ Options:
     --check-only    Validate YAML structure only, no code is generated
     --dry-run       Print generated code to stdout without writing to files
     --verbose       Print detailed info during parsing and code generation
+
+Environment:
+    CEVO_YAML_CACHE=1   Cache the validated YAML next to the input (`<input>.cache`)
+                        and reuse it while the input file is unchanged
 """
 
 from main import main
@@ -30,19 +30,20 @@ def main():
             sys.exit(0)
 
         # === Code Generators ===
-        header_gen = HeaderGenerator(parser.commands)
-        table_gen = SignatureTableGenerator(parser.commands, parser.includes)
-        invoke_gen = InvokeGenerator(parser.commands, parser.includes)
+        header_gen = HeaderGenerator(parser.commands, parser.hashes)
+        table_gen = SignatureTableGenerator(parser.commands, parser.includes, parser.hashes)
+        invoke_gen = InvokeGenerator(parser.commands, parser.includes, parser.hashes)
 
         if args.dry_run:
-            print("\n// ==== HEADER FILE ====\n")
-            print(header_gen.render(args.header))
-
-            print("\n// ==== SIGNATURE TABLE ====\n")
-            print(table_gen.render(args.sigtable))
-
-            print("\n// ==== INVOKE HANDLER ====\n")
-            print(invoke_gen.render(args.invoke))
+            # Render straight into stdout rather than building each file as a string
+            for title, gen, filename in (
+                ("HEADER FILE", header_gen, args.header),
+                ("SIGNATURE TABLE", table_gen, args.sigtable),
+                ("INVOKE HANDLER", invoke_gen, args.invoke),
+            ):
+                sys.stdout.write(f"\n// ==== {title} ====\n\n")
+                gen.render(filename, stream=sys.stdout)
+                sys.stdout.write("\n")
         else:
             header_gen.write_to(Path(args.header))
             table_gen.write_to(Path(args.sigtable))
@@ -3,9 +3,76 @@
 YAML command definition parser and validator.
 """
 
+import functools
+import hashlib
+import os
+import pickle
+import re
+import sys
+import tempfile
+from collections import Counter
 from pathlib import Path
-from ruamel.yaml import YAML
-from utils import djb2_hash, TYPE_MAP
+import yaml
+import utils
+from utils import batch_djb2, resolve_arg_types, TYPE_INDEX
+
+try:
+    from yaml import CSafeLoader as _BaseSafeLoader
+except ImportError:
+    from yaml import SafeLoader as _BaseSafeLoader
+
+
+class SafeLoader(_BaseSafeLoader):
+    """
+    Safe YAML loader that only reads true/false as booleans, as YAML 1.2 does,
+    and rejects duplicate mapping keys instead of keeping the last value.
+    """
+
+    def construct_mapping(self, node, deep=False):
+        if isinstance(node, yaml.MappingNode):
+            seen = set()
+            for key_node, _ in node.value:
+                # `<<` merge keys may legitimately be overridden by explicit keys
+                if key_node.tag == "tag:yaml.org,2002:merge":
+                    continue
+                key = self.construct_object(key_node, deep=deep)
+                try:
+                    duplicate = key in seen
+                except TypeError:
+                    # Unhashable keys are reported by the base constructor
+                    continue
+                if duplicate:
+                    raise yaml.constructor.ConstructorError(
+                        "while constructing a mapping",
+                        node.start_mark,
+                        f"found duplicate key {key!r}",
+                        key_node.start_mark,
+                    )
+                seen.add(key)
+        return super().construct_mapping(node, deep=deep)
+
+
+# Drop the YAML 1.1 yes/no/on/off booleans, so names such as `on` stay strings
+_BOOL_TAG = "tag:yaml.org,2002:bool"
+SafeLoader.yaml_implicit_resolvers = {
+    first: [(tag, regexp) for tag, regexp in resolvers if tag != _BOOL_TAG]
+    for first, resolvers in _BaseSafeLoader.yaml_implicit_resolvers.items()
+}
+SafeLoader.add_implicit_resolver(
+    _BOOL_TAG, re.compile(r"^(?:true|True|TRUE|false|False|FALSE)$"), list("tTfF")
+)
+
+# A C identifier: a letter or underscore followed by letters, digits or underscores
+_C_IDENT_RE = re.compile(r"[A-Za-z_]\w*\Z", re.ASCII)
+
+
+@functools.lru_cache(maxsize=None)
+def _generator_digest() -> str:
+    """Digest of the parser and utils sources that shape cached parse results."""
+    digest = hashlib.sha1()
+    for module_file in (__file__, utils.__file__):
+        digest.update(Path(module_file).read_bytes())
+    return digest.hexdigest()
 
 
 class CommandParser:
@@ -16,19 +83,35 @@ class CommandParser:
 
     ALLOWED_KEYS = {"commands", "includes"}
 
+    # Set to "1" to reuse parsed results from a pickle stored next to the input
+    CACHE_ENV = "CEVO_YAML_CACHE"
+
     def __init__(self, input_file: Path):
-        self.yaml = YAML()
-        self.yaml.preserve_quotes = True
-        self.yaml.indent(mapping=2, sequence=4, offset=2)
         self.input_file = input_file
         self.commands = []
         self.includes = []
+        self.hashes = {}
 
     def load(self):
         """Load and parse the YAML file, then validate its structure."""
         if not self.input_file.exists():
             raise FileNotFoundError(f"YAML input file not found: {self.input_file}")
-        data = self.yaml.load(self.input_file)
+
+        cache_file = None
+        stat = self.input_file.stat()
+        raw = self.input_file.read_bytes()
+        if os.environ.get(self.CACHE_ENV) == "1":
+            cache_key = (
+                _generator_digest(),
+                stat.st_mtime_ns,
+                stat.st_size,
+                hashlib.sha1(raw).hexdigest(),
+            )
+            cache_file = self.input_file.with_name(self.input_file.name + ".cache")
+            if self._load_cache(cache_file, cache_key):
+                return
+
+        data = yaml.load(raw, Loader=SafeLoader)
 
         if data is None:
             raise ValueError(f"YAML input file '{self.input_file}' is empty or invalid")
@@ -48,11 +131,58 @@ class CommandParser:
 
         self._validate()
 
+        if cache_file is not None:
+            self._store_cache(cache_file, cache_key)
+
+    def _load_cache(self, cache_file: Path, cache_key: tuple) -> bool:
+        """
+        Restore commands, includes and hashes from the cache if its key matches.
+
+        The key is stored as a separate pickle ahead of the payload so a stale
+        cache is rejected without unpickling the command list. It includes a
+        digest of the generator sources, so upgrading the tools invalidates it.
+        """
+        try:
+            with cache_file.open("rb") as f:
+                if pickle.load(f) != cache_key:
+                    return False
+                self.commands, self.includes, self.hashes = pickle.load(f)
+        except Exception:
+            # Missing, truncated or foreign cache files simply trigger a re-parse
+            return False
+        # Unpickling yields fresh strings; re-intern tokens as _validate() does
+        for cmd in self.commands:
+            for arg in cmd.get("args", []):
+                arg["type"] = sys.intern(arg["type"])
+            resolve_arg_types(cmd)
+        return True
+
+    def _store_cache(self, cache_file: Path, cache_key: tuple):
+        """Atomically write the validated commands, includes and hashes to the cache."""
+        # Caching is best effort; a read-only input directory is not an error
+        try:
+            fd, tmp_name = tempfile.mkstemp(dir=cache_file.parent, prefix=cache_file.name)
+        except OSError:
+            return
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(cache_key, f, pickle.HIGHEST_PROTOCOL)
+                # Derived "_enums"/"_casts" are recomputed on load from the current type table
+                commands = [
+                    {key: value for key, value in cmd.items() if not key.startswith("_")}
+                    for cmd in self.commands
+                ]
+                payload = (commands, self.includes, self.hashes)
+                pickle.dump(payload, f, pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_name, cache_file)
+        except OSError:
+            try:
+                os.unlink(tmp_name)
+            except OSError:
+                pass
+
     def _validate(self):
         """Validate command structure, types, name formats, and detect hash collisions."""
-        seen_hashes = {}
-        seen_names = set()
-
         for i, cmd in enumerate(self.commands):
             name = cmd.get("name")
             handler = cmd.get("handler")
@@ -60,6 +190,9 @@ class CommandParser:
             if not name or not handler:
                 raise ValueError(f"Command #{i + 1} is missing 'name' or 'handler'")
 
+            if not isinstance(name, str) or not isinstance(handler, str):
+                raise ValueError(f"❌ Command #{i + 1}: 'name' and 'handler' must be strings")
+
             if not self._is_valid_c_identifier(name):
                 raise ValueError(f"❌ Invalid command name '{name}': must be a valid C identifier")
 
@@ -68,17 +201,6 @@ class CommandParser:
                     f"❌ Invalid handler name '{handler}': must be a valid C identifier"
                 )
 
-            if name in seen_names:
-                raise ValueError(f"❌ Duplicate command name: '{name}'")
-            seen_names.add(name)
-
-            hash_val = djb2_hash(name)
-            if hash_val in seen_hashes:
-                raise ValueError(
-                    f"❌ Hash collision: '{name}' and '{seen_hashes[hash_val]}' both hash to 0x{hash_val:08X}"
-                )
-            seen_hashes[hash_val] = name
-
             args = cmd.get("args", [])
             if not isinstance(args, list):
                 raise ValueError(f"'args' for command '{name}' must be a list")
@@ -88,14 +210,29 @@ class CommandParser:
                     raise ValueError(f"❌ Each argument of command '{name}' must be a dict")
                 if "type" not in arg:
                     raise ValueError(f"❌ Missing 'type' in command '{name}' argument")
-                if arg["type"] not in TYPE_MAP:
+                if not isinstance(arg["type"], str) or arg["type"] not in TYPE_INDEX:
                     raise ValueError(f"❌ Unsupported type '{arg['type']}' in command '{name}'")
+                arg["type"] = sys.intern(arg["type"])
+
+            resolve_arg_types(cmd)
+
+        names = [cmd["name"] for cmd in self.commands]
+        duplicate = next((name for name, count in Counter(names).items() if count > 1), None)
+        if duplicate is not None:
+            raise ValueError(f"❌ Duplicate command name: '{duplicate}'")
+
+        self.hashes = batch_djb2(names)
+        if len(set(self.hashes.values())) != len(self.hashes):
+            # Only walk the names again to report which pair collided
+            seen_hashes = {}
+            for name, hash_val in self.hashes.items():
+                if hash_val in seen_hashes:
+                    raise ValueError(
+                        f"❌ Hash collision: '{name}' and '{seen_hashes[hash_val]}' both hash to 0x{hash_val:08X}"
+                    )
+                seen_hashes[hash_val] = name
 
     @staticmethod
     def _is_valid_c_identifier(identifier: str) -> bool:
         """Return True if the given name is a valid C identifier."""
-        if not identifier:
-            return False
-        if not (identifier[0].isalpha() or identifier[0] == "_"):
-            return False
-        return all(c.isalnum() or c == "_" for c in identifier)
+        return bool(identifier) and _C_IDENT_RE.match(identifier) is not None
@@ -3,6 +3,7 @@
 Unit tests for C code generation.
 """
 
+import io
 import sys
 import os
 import pytest
@@ -12,7 +13,7 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")
 from gen_header import HeaderGenerator
 from gen_signature_table import SignatureTableGenerator
 from gen_invoke_handler import InvokeGenerator
-from utils import djb2_hash
+from utils import djb2_hash, RENDER_CACHE_SIZE
 
 
 sample_cmds = [
@@ -133,3 +134,72 @@ def test_enum_hash_values():
         value_str = f"= 0x{value:08X}u"
         assert enum_line in content
         assert value_str in content
+
+
+def test_render_to_stream_matches_string():
+    """
+    Rendering into a stream should produce the same text as the returned string.
+    """
+    for gen, filename in [
+        (HeaderGenerator(sample_cmds), "core_api.h"),
+        (SignatureTableGenerator(sample_cmds, ["demo.h"]), "ce_table.c"),
+        (InvokeGenerator(sample_cmds, ["demo.h"]), "ce_invoke_handler.c"),
+    ]:
+        stream = io.StringIO()
+        assert gen.render(filename, stream=stream) is None
+        assert stream.getvalue() == gen.render(filename)
+
+
+def test_render_is_memoized_per_input():
+    """
+    Rendering the same commands twice should reuse the cached output,
+    while different includes must produce a fresh render.
+    """
+    first = SignatureTableGenerator(sample_cmds, []).render("ce_table.c")
+    again = SignatureTableGenerator(sample_cmds, []).render("ce_table.c")
+    other = SignatureTableGenerator(sample_cmds, ["extra.h"]).render("ce_table.c")
+    assert again is first
+    assert '#include "extra.h"' in other
+    assert '#include "extra.h"' not in first
+
+
+def test_render_memo_respects_hashes():
+    """Generators given different hashes must not share a memoized render."""
+    plain = HeaderGenerator(sample_cmds).render("x.h")
+    hashes = {cmd["name"]: djb2_hash(cmd["name"]) for cmd in sample_cmds}
+    hashes["reset"] = 0xDEADBEEF
+    custom = HeaderGenerator(sample_cmds, hashes).render("x.h")
+    assert "0xDEADBEEF" in custom
+    assert "0xDEADBEEF" not in plain
+
+
+def test_render_memo_is_bounded():
+    """Only the most recently used renders are kept."""
+    first = HeaderGenerator(sample_cmds).render("bounded_0.h")
+    for i in range(1, RENDER_CACHE_SIZE + 1):
+        HeaderGenerator(sample_cmds).render(f"bounded_{i}.h")
+    assert HeaderGenerator(sample_cmds).render("bounded_0.h") is not first
+
+
+def test_header_render_without_handler():
+    """The header only needs command names; the memo key must not require a handler."""
+    output = HeaderGenerator([{"name": "x"}]).render("a.h")
+    assert "CE_CMD_X_e" in output
+
+
+def test_invoke_handler_perfect_hash_for_large_sets():
+    """
+    Large command sets should dispatch through a table indexed by a perfect hash.
+    """
+    cmds = [{"name": f"cmd_{i}", "handler": f"handler_{i}"} for i in range(40)]
+    code = InvokeGenerator(cmds, []).render("ce_invoke_handler.c")
+    assert "#define CE_PHF_SIZE (40u)" in code
+    assert "ce_phf_index(hash_u32)" in code
+    assert "return ce_dispatch_table_apf[index_u32](sig_pst, args_a);" in code
+    assert "switch" not in code
+    # Zero-argument stubs must not leave args_a unused under -Wextra
+    assert code.count("    (void)args_a;\n") == 40
+    for i in range(40):
+        assert f"static bool ce_call_cmd_{i}(" in code
+        assert f"    ce_call_cmd_{i},\n" in code
+        assert f"    CE_CMD_CMD_{i}_e,\n" in code
@@ -3,8 +3,10 @@
 Unit tests for YAML validation in parser.py
 """
 
+import pickle
 import pytest
 from pathlib import Path
+from yaml.constructor import ConstructorError
 from parser import CommandParser
 
 
@@ -68,6 +70,19 @@ def test_parser_missing_handler(tmp_path):
         parser.load()
 
 
+def test_parser_non_string_name(tmp_path):
+    """A name that YAML reads as a number should be rejected with a readable error."""
+    yaml = """
+    commands:
+      - name: 42
+        handler: test_func
+    """
+    file = write_yaml(tmp_path, yaml)
+    parser = CommandParser(file)
+    with pytest.raises(ValueError, match="'name' and 'handler' must be strings"):
+        parser.load()
+
+
 # --------------------------------------------------------------------
 # Semantic Errors
 # --------------------------------------------------------------------
@@ -114,6 +129,19 @@ def test_parser_invalid_handler_format(tmp_path):
         parser.load()
 
 
+def test_parser_non_ascii_name(tmp_path):
+    """Non-ASCII letters are not valid in C identifiers and should be rejected."""
+    yaml = """
+    commands:
+      - name: "réinit"
+        handler: valid_handler
+    """
+    file = write_yaml(tmp_path, yaml)
+    parser = CommandParser(file)
+    with pytest.raises(ValueError, match=r"Invalid command name 'réinit'"):
+        parser.load()
+
+
 def test_parser_duplicate_names(tmp_path):
     """Duplicate command names should be rejected before hashing."""
     yaml = """
@@ -129,6 +157,66 @@ def test_parser_duplicate_names(tmp_path):
         parser.load()
 
 
+def test_parser_hash_collision(tmp_path):
+    """Distinct names with the same DJB2 hash should be rejected."""
+    yaml = """
+    commands:
+      - name: hetairas
+        handler: h1
+      - name: mentioner
+        handler: h2
+    """
+    file = write_yaml(tmp_path, yaml)
+    parser = CommandParser(file)
+    with pytest.raises(ValueError, match=r"Hash collision: 'mentioner' and 'hetairas'"):
+        parser.load()
+
+
+def test_parser_on_off_names_stay_strings(tmp_path):
+    """YAML 1.1 booleans such as on/off should be read as plain names."""
+    yaml = """
+    commands:
+      - name: on
+        handler: led_on
+      - name: off
+        handler: led_off
+    """
+    file = write_yaml(tmp_path, yaml)
+    parser = CommandParser(file)
+    parser.load()
+    assert [cmd["name"] for cmd in parser.commands] == ["on", "off"]
+
+
+def test_parser_duplicate_commands_section(tmp_path):
+    """A repeated top-level key must not silently discard the first block."""
+    yaml = """
+    commands:
+      - name: first
+        handler: h1
+    commands:
+      - name: second
+        handler: h2
+    """
+    file = write_yaml(tmp_path, yaml)
+    parser = CommandParser(file)
+    with pytest.raises(ConstructorError, match=r"found duplicate key 'commands'"):
+        parser.load()
+
+
+def test_parser_duplicate_handler_key(tmp_path):
+    """A command with two 'handler' keys should be rejected."""
+    yaml = """
+    commands:
+      - name: ping
+        handler: ha
+        handler: hc
+    """
+    file = write_yaml(tmp_path, yaml)
+    parser = CommandParser(file)
+    with pytest.raises(ConstructorError, match=r"found duplicate key 'handler'"):
+        parser.load()
+
+
 def test_parser_field_order_flexibility(tmp_path):
     """Command with out-of-order fields should still parse correctly."""
     yaml = """
@@ -142,3 +230,97 @@ def test_parser_field_order_flexibility(tmp_path):
     parser = CommandParser(file)
     parser.load()
     assert parser.commands[0]["name"] == "shuffle"
+
+
+def test_parser_interns_type_tokens(tmp_path):
+    """Validated type tokens should be the interned TYPE_NAMES strings."""
+    from utils import TYPE_INDEX, TYPE_NAMES
+
+    yaml = """
+    commands:
+      - name: typed
+        handler: typed_handler
+        args:
+          - type: u16
+    """
+    file = write_yaml(tmp_path, yaml)
+    parser = CommandParser(file)
+    parser.load()
+    token = parser.commands[0]["args"][0]["type"]
+    assert token is TYPE_NAMES[TYPE_INDEX["u16"]]
+
+
+# --------------------------------------------------------------------
+# Parse Cache
+# --------------------------------------------------------------------
+def test_parser_cache_reuse(tmp_path, monkeypatch):
+    """With CEVO_YAML_CACHE=1 a second load should not re-parse the YAML."""
+    import parser as parser_module
+    from utils import TYPE_INDEX, TYPE_NAMES
+
+    yaml = """
+    commands:
+      - name: cached_cmd
+        handler: cached_func
+      - name: typed_cmd
+        handler: typed_func
+        args:
+          - type: u16
+    """
+    file = write_yaml(tmp_path, yaml)
+    monkeypatch.setenv("CEVO_YAML_CACHE", "1")
+    CommandParser(file).load()
+    assert (tmp_path / "test.yaml.cache").exists()
+
+    def fail(*args, **kwargs):
+        raise AssertionError("YAML should have been served from the cache")
+
+    monkeypatch.setattr(parser_module.yaml, "load", fail)
+    parser = CommandParser(file)
+    parser.load()
+    assert parser.commands[0]["name"] == "cached_cmd"
+    assert parser.commands[0]["_casts"] == ()
+
+    # Cached type tokens are still the interned TYPE_NAMES strings
+    token = parser.commands[1]["args"][0]["type"]
+    assert token is TYPE_NAMES[TYPE_INDEX["u16"]]
+
+    # Derived type columns are recomputed on load, never stored
+    with (tmp_path / "test.yaml.cache").open("rb") as f:
+        pickle.load(f)
+        commands, _, _ = pickle.load(f)
+    assert not any(key.startswith("_") for key in commands[0])
+
+
+def test_parser_cache_invalidated_on_change(tmp_path, monkeypatch):
+    """Editing the YAML file must invalidate a previously written cache."""
+    monkeypatch.setenv("CEVO_YAML_CACHE", "1")
+    file = write_yaml(tmp_path, "commands:\n  - name: old\n    handler: h\n")
+    CommandParser(file).load()
+
+    file.write_text("commands:\n  - name: renamed\n    handler: h\n")
+    parser = CommandParser(file)
+    parser.load()
+    assert parser.commands[0]["name"] == "renamed"
+
+
+def test_parser_cache_invalidated_on_tool_change(tmp_path, monkeypatch):
+    """A cache written by different generator sources must be re-parsed and re-validated."""
+    import parser as parser_module
+
+    monkeypatch.setenv("CEVO_YAML_CACHE", "1")
+    file = write_yaml(
+        tmp_path, "commands:\n  - name: cmd\n    handler: h\n    args: [{type: u8}]\n"
+    )
+    CommandParser(file).load()
+
+    calls = []
+    real_load = parser_module.yaml.load
+    monkeypatch.setattr(parser_module, "_generator_digest", lambda: "upgraded")
+    monkeypatch.setattr(
+        parser_module.yaml, "load", lambda *a, **kw: calls.append(1) or real_load(*a, **kw)
+    )
+    parser = CommandParser(file)
+    parser.load()
+    assert calls == [1]
+    assert parser.commands[0]["_casts"] == ("uint8_t",)
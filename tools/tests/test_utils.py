@@ -5,10 +5,20 @@ Unit tests for hash function in utils.py
 
 import sys
 import os
+import pytest
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-from utils import djb2_hash
+from utils import (
+    batch_djb2,
+    djb2_hash,
+    _djb2_hash_py,
+    build_perfect_hash,
+    get_ctype,
+    get_enum,
+    perfect_hash_index,
+    TYPE_MAP,
+)
 
 
 def test_djb2_hash_known_values():
@@ -40,8 +50,74 @@ def test_djb2_hash_case_sensitive():
 
 def test_djb2_hash_unicode():
     """
-    Hash should handle Unicode strings (assuming utf-8 encoding in implementation).
-    Just verify it returns an integer.
+    Non-ASCII strings are hashed over their UTF-8 bytes, like the C runtime.
     """
-    result = djb2_hash("cömmand")
-    assert isinstance(result, int)
+    assert djb2_hash("cömmand") == _djb2_hash_py("cömmand")
+    assert djb2_hash("ö") == ((5381 * 33 + 0xC3) * 33 + 0xB6) & 0xFFFFFFFF
+
+
+def test_djb2_hash_multibyte_regression():
+    """
+    Multi-byte characters contribute every UTF-8 byte, not their code point.
+    unit_test/test_hash.cpp pins the same values for ce_hash_calculate().
+    """
+    assert djb2_hash("set_€") == 0x8C2CF4E0  # 3-byte sequence e2 82 ac
+    assert djb2_hash("cmd_🙂") == 0x9035C582  # 4-byte sequence f0 9f 99 82
+
+
+def test_djb2_hash_long_strings_stay_32bit():
+    """Block-wise folding must match a per-byte 32-bit reduction on long inputs."""
+    for length in (7, 8, 9, 32, 100):
+        string = "set_mac_" * length
+        expected = 5381
+        for byte in string.encode("utf-8"):
+            expected = (expected * 33 + byte) & 0xFFFFFFFF
+        assert _djb2_hash_py(string) == expected
+
+
+def test_djb2_hash_cache_matches_uncached():
+    """Cached results must equal a forced recomputation through __wrapped__."""
+    for string in ["set_mac", "set_mac", "cömmand"]:
+        assert djb2_hash(string) == djb2_hash.__wrapped__(string)
+
+
+def test_djb2_native_matches_python():
+    """The optional `_djb2` extension must agree with the pure-Python hash."""
+    native = pytest.importorskip("_djb2")
+    strings = [
+        "",
+        "reset",
+        "set_mac",
+        "set_mac_",
+        "set_speed",
+        "cat_mixed_" * 16,
+        "cömmand",
+        "∑",
+    ]
+    for string in strings:
+        assert native.djb2(string) == _djb2_hash_py(string)
+    assert native.djb2_many(iter(strings)) == [_djb2_hash_py(s) for s in strings]
+
+
+def test_batch_djb2_maps_each_name():
+    """batch_djb2 returns the same hash as djb2_hash for every name."""
+    names = (f"cmd_{i}" for i in range(50))
+    assert batch_djb2(names) == {f"cmd_{i}": djb2_hash(f"cmd_{i}") for i in range(50)}
+
+
+def test_type_columns_match_type_map():
+    """get_enum/get_ctype read the same entries as the legacy TYPE_MAP."""
+    for alias, (enum, ctype) in TYPE_MAP.items():
+        assert get_enum(alias) == enum
+        assert get_ctype(alias) == ctype
+    assert get_enum("u8") == get_enum("uint8") == "TYPE_UINT8_e"
+    with pytest.raises(KeyError):
+        get_ctype("float")
+
+
+def test_perfect_hash_is_minimal_and_collision_free():
+    """Every hash must map to a distinct slot in range(len(hashes))."""
+    hashes = [djb2_hash(f"cmd_{i}") for i in range(300)]
+    seeds = build_perfect_hash(hashes)
+    slots = sorted(perfect_hash_index(h, seeds) for h in hashes)
+    assert slots == list(range(len(hashes)))
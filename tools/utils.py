@@ -3,43 +3,256 @@
 Utility definitions for hash function and type mapping.
 """
 
-# Static map: YAML string types -> (C enum, C type)
+import functools
+import sys
+from collections import OrderedDict
+from operator import mul
+from types import MappingProxyType
+
+try:
+    # Optional native hash, built by tools/CMakeLists.txt when Python headers are available
+    from _djb2 import djb2 as _c_djb2, djb2_many as _c_djb2_many
+except ImportError:
+    _c_djb2 = _c_djb2_many = None
+
+# Buffer size for streaming generated sources to disk
+WRITE_BUFFER_SIZE = 1 << 16
+
+# Rendered outputs kept per generator render() method
+RENDER_CACHE_SIZE = 8
+
+# Pure-Python DJB2 folds whole blocks as one polynomial in 33 (Horner form):
+# h' = h * 33^B + sum(b[i] * 33^(B-1-i)), with all powers reduced mod 2^32
+_DJB2_BLOCK = 64
+_DJB2_BLOCK_POW = pow(33, _DJB2_BLOCK, 1 << 32)
+_DJB2_BLOCK_COEFFS = tuple(pow(33, _DJB2_BLOCK - 1 - i, 1 << 32) for i in range(_DJB2_BLOCK))
+
+# Perfect-hash mixing multiplier (golden ratio) and seed search bound
+PHF_MULTIPLIER = 0x9E3779B1
+PHF_MAX_SEED = 1 << 16
+
+# Canonical type table: (YAML type, C enum, C type)
 # Aliases provided for user flexibility (e.g., u8 == uint8)
-TYPE_MAP = {
+_TYPE_TABLE = (
     # Unsigned integers
-    "uint8": ("TYPE_UINT8_e", "uint8_t"),
-    "uint16": ("TYPE_UINT16_e", "uint16_t"),
-    "uint32": ("TYPE_UINT32_e", "uint32_t"),
-    "uint64": ("TYPE_UINT64_e", "uint64_t"),
-    "u8": ("TYPE_UINT8_e", "uint8_t"),
-    "u16": ("TYPE_UINT16_e", "uint16_t"),
-    "u32": ("TYPE_UINT32_e", "uint32_t"),
-    "u64": ("TYPE_UINT64_e", "uint64_t"),
+    ("uint8", "TYPE_UINT8_e", "uint8_t"),
+    ("uint16", "TYPE_UINT16_e", "uint16_t"),
+    ("uint32", "TYPE_UINT32_e", "uint32_t"),
+    ("uint64", "TYPE_UINT64_e", "uint64_t"),
+    ("u8", "TYPE_UINT8_e", "uint8_t"),
+    ("u16", "TYPE_UINT16_e", "uint16_t"),
+    ("u32", "TYPE_UINT32_e", "uint32_t"),
+    ("u64", "TYPE_UINT64_e", "uint64_t"),
     # Signed integers
-    "int8": ("TYPE_INT8_e", "int8_t"),
-    "int16": ("TYPE_INT16_e", "int16_t"),
-    "int32": ("TYPE_INT32_e", "int32_t"),
-    "int64": ("TYPE_INT64_e", "int64_t"),
-    "i8": ("TYPE_INT8_e", "int8_t"),
-    "i16": ("TYPE_INT16_e", "int16_t"),
-    "i32": ("TYPE_INT32_e", "int32_t"),
-    "i64": ("TYPE_INT64_e", "int64_t"),
+    ("int8", "TYPE_INT8_e", "int8_t"),
+    ("int16", "TYPE_INT16_e", "int16_t"),
+    ("int32", "TYPE_INT32_e", "int32_t"),
+    ("int64", "TYPE_INT64_e", "int64_t"),
+    ("i8", "TYPE_INT8_e", "int8_t"),
+    ("i16", "TYPE_INT16_e", "int16_t"),
+    ("i32", "TYPE_INT32_e", "int32_t"),
+    ("i64", "TYPE_INT64_e", "int64_t"),
     # Native types
-    "bool": ("TYPE_BOOL_e", "bool"),
-    "b": ("TYPE_BOOL_e", "bool"),
+    ("bool", "TYPE_BOOL_e", "bool"),
+    ("b", "TYPE_BOOL_e", "bool"),
     # String
-    "string": ("TYPE_STRING_e", "const char*"),
-    "str": ("TYPE_STRING_e", "const char*"),
-    "s": ("TYPE_STRING_e", "const char*"),
+    ("string", "TYPE_STRING_e", "const char*"),
+    ("str", "TYPE_STRING_e", "const char*"),
+    ("s", "TYPE_STRING_e", "const char*"),
     # Binary buffer (parsed hex)
-    "uint8_ptr": ("TYPE_UINT8_PTR_e", "const uint8_t*"),
-    "u8p": ("TYPE_UINT8_PTR_e", "const uint8_t*"),
-}
+    ("uint8_ptr", "TYPE_UINT8_PTR_e", "const uint8_t*"),
+    ("u8p", "TYPE_UINT8_PTR_e", "const uint8_t*"),
+)
 
+# Struct-of-arrays view of _TYPE_TABLE; TYPE_INDEX maps a YAML type to its row.
+# Names are interned so tokens interned by the parser match on identity.
+TYPE_NAMES = tuple(sys.intern(row[0]) for row in _TYPE_TABLE)
+TYPE_ENUMS = tuple(row[1] for row in _TYPE_TABLE)
+TYPE_CTYPES = tuple(row[2] for row in _TYPE_TABLE)
+TYPE_INDEX = MappingProxyType({name: index for index, name in enumerate(TYPE_NAMES)})
 
-def djb2_hash(string: str) -> int:
-    """Compute a 32-bit DJB2 hash."""
+# [DEPRECATED] Static map: YAML string types -> (C enum, C type). Use TYPE_INDEX,
+# get_enum() and get_ctype() instead.
+TYPE_MAP = MappingProxyType(
+    {name: (enum, ctype) for name, enum, ctype in zip(TYPE_NAMES, TYPE_ENUMS, TYPE_CTYPES)}
+)
+
+
+def _djb2_hash_py(string: str) -> int:
+    """Compute a 32-bit DJB2 hash of the UTF-8 encoding of `string` in pure Python."""
+    data = string.encode("utf-8")
     hash_value = 5381
-    for char in string:
-        hash_value = ((hash_value << 5) + hash_value) + ord(char)
+    # Identifiers are short: a plain loop beats the block setup and stays small
+    if len(data) < _DJB2_BLOCK:
+        for byte in data:
+            hash_value = hash_value * 33 + byte
+        return hash_value & 0xFFFFFFFF
+    tail = len(data) - len(data) % _DJB2_BLOCK
+    # Whole blocks: the products are summed in C by map()/sum() and masked once
+    for start in range(0, tail, _DJB2_BLOCK):
+        block = data[start : start + _DJB2_BLOCK]
+        hash_value = (
+            hash_value * _DJB2_BLOCK_POW + sum(map(mul, block, _DJB2_BLOCK_COEFFS))
+        ) & 0xFFFFFFFF
+    for byte in data[tail:]:
+        hash_value = hash_value * 33 + byte
     return hash_value & 0xFFFFFFFF
+
+
+@functools.lru_cache(maxsize=4096)
+def djb2_hash(string: str) -> int:
+    """
+    Compute a 32-bit DJB2 hash over the UTF-8 bytes of `string`.
+
+    Matches ce_hash_calculate() on the target, which hashes the raw bytes of the
+    command token. Uses the `_djb2` extension when it is built. Results are
+    cached, since generation hashes the same command names repeatedly;
+    the uncached function remains available as `djb2_hash.__wrapped__`.
+    """
+    if _c_djb2 is not None:
+        return _c_djb2(string)
+    return _djb2_hash_py(string)
+
+
+def get_enum(token: str) -> str:
+    """Return the C enum of a YAML type token; raises KeyError if unknown."""
+    return TYPE_ENUMS[TYPE_INDEX[token]]
+
+
+def get_ctype(token: str) -> str:
+    """Return the C type of a YAML type token; raises KeyError if unknown."""
+    return TYPE_CTYPES[TYPE_INDEX[token]]
+
+
+def phf_mix(hash_u32: int, seed: int) -> int:
+    """Scramble a 32-bit hash with a seed; mirrors ce_phf_mix() in generated C."""
+    value = ((hash_u32 ^ seed) * PHF_MULTIPLIER) & 0xFFFFFFFF
+    return value ^ (value >> 16)
+
+
+def build_perfect_hash(hashes: list) -> list:
+    """
+    Build a minimal perfect hash over distinct 32-bit hashes (hash and displace).
+
+    Every hash lands in bucket `phf_mix(h, 0) % n`. Buckets with several hashes are
+    given the smallest seed `d >= 1` that moves all of them to free slots
+    `phf_mix(h, d) % n`; single-entry buckets take a remaining slot directly,
+    stored as `-slot - 1`.
+
+    Args:
+        hashes: Distinct 32-bit hash values.
+
+    Returns:
+        The displacement table; see `perfect_hash_index()` for the lookup.
+    """
+    n = len(hashes)
+    buckets = [[] for _ in range(n)]
+    for hash_u32 in hashes:
+        buckets[phf_mix(hash_u32, 0) % n].append(hash_u32)
+
+    displacements = [0] * n
+    taken = [False] * n
+    for b in sorted(range(n), key=lambda b: len(buckets[b]), reverse=True):
+        bucket = buckets[b]
+        if len(bucket) < 2:
+            break
+        for seed in range(1, PHF_MAX_SEED + 1):
+            slots = {phf_mix(hash_u32, seed) % n for hash_u32 in bucket}
+            if len(slots) == len(bucket) and not any(taken[slot] for slot in slots):
+                break
+        else:
+            raise ValueError(f"Unable to build a perfect hash over {n} command hashes")
+        for slot in slots:
+            taken[slot] = True
+        displacements[b] = seed
+
+    free_slots = iter([slot for slot in range(n) if not taken[slot]])
+    for b, bucket in enumerate(buckets):
+        if len(bucket) == 1:
+            displacements[b] = -next(free_slots) - 1
+    return displacements
+
+
+def perfect_hash_index(hash_u32: int, displacements: list) -> int:
+    """Return the slot of a hash in a table built by `build_perfect_hash()`."""
+    n = len(displacements)
+    seed = displacements[phf_mix(hash_u32, 0) % n]
+    if seed < 0:
+        return -seed - 1
+    return phf_mix(hash_u32, seed) % n
+
+
+def batch_djb2(names) -> dict:
+    """Compute the DJB2 hash of each name once, returned as a name -> hash map."""
+    if _c_djb2_many is not None:
+        names = list(names)
+        return dict(zip(names, _c_djb2_many(names)))
+    return {name: djb2_hash(name) for name in names}
+
+
+def resolve_arg_types(cmd: dict) -> tuple:
+    """
+    Return the (C enums, C types) tuples for a command's arguments.
+
+    The result is stored on the command as "_enums"/"_casts", so the TYPE_INDEX
+    lookups done during validation are reused by every generator.
+    """
+    if "_enums" not in cmd:
+        rows = [TYPE_INDEX[arg["type"]] for arg in cmd.get("args", [])]
+        cmd["_enums"] = tuple(TYPE_ENUMS[row] for row in rows)
+        cmd["_casts"] = tuple(TYPE_CTYPES[row] for row in rows)
+    return cmd["_enums"], cmd["_casts"]
+
+
+def render_key(commands, includes=(), hashes=None) -> tuple:
+    """Build a hashable snapshot of the YAML inputs that determine generated output."""
+    hashes = hashes or {}
+    return (
+        tuple(
+            (
+                cmd["name"],
+                cmd.get("handler"),
+                tuple(arg["type"] for arg in cmd.get("args", [])),
+                hashes.get(cmd["name"]),
+            )
+            for cmd in commands
+        ),
+        tuple(includes),
+    )
+
+
+def memoize_render(render):
+    """
+    Memoize a generator's `render(filename, stream=None)` method.
+
+    Results are keyed on the file name and a `render_key()` of the generator's
+    commands, includes and hashes. The key is built on first use and kept on the
+    instance, so commands must not be mutated afterwards. Only the
+    RENDER_CACHE_SIZE most recently used outputs are kept. A render into a
+    stream that is not cached yet is streamed straight through without being
+    cached, so large outputs are never held in memory twice.
+    """
+    cache = OrderedDict()
+
+    @functools.wraps(render)
+    def wrapper(self, filename, stream=None):
+        if stream is not None and not cache:
+            return render(self, filename, stream)
+        if self.__dict__.get("_render_key") is None:
+            self._render_key = render_key(self.commands, getattr(self, "includes", ()), self.hashes)
+        key = (filename, self._render_key)
+        text = cache.get(key)
+        if text is None:
+            if stream is not None:
+                return render(self, filename, stream)
+            text = cache[key] = render(self, filename)
+            if len(cache) > RENDER_CACHE_SIZE:
+                cache.popitem(last=False)
+        else:
+            cache.move_to_end(key)
+        if stream is None:
+            return text
+        stream.write(text)
+        return None
+
+    return wrapper
@@ -0,0 +1,58 @@
+/* SPDX-License-Identifier: Apache-2.0 */
+
+#ifndef PHF_HANDLERS_H
+#define PHF_HANDLERS_H
+
+#ifdef __cplusplus
+extern "C" {
+#endif
+
+#include <stdbool.h>
+#include <stdint.h>
+
+bool phf_void_0(void);
+bool phf_set_1(uint32_t value);
+bool phf_void_2(void);
+bool phf_set_3(uint32_t value);
+bool phf_void_4(void);
+bool phf_set_5(uint32_t value);
+bool phf_void_6(void);
+bool phf_set_7(uint32_t value);
+bool phf_void_8(void);
+bool phf_set_9(uint32_t value);
+bool phf_void_10(void);
+bool phf_set_11(uint32_t value);
+bool phf_void_12(void);
+bool phf_set_13(uint32_t value);
+bool phf_void_14(void);
+bool phf_set_15(uint32_t value);
+bool phf_void_16(void);
+bool phf_set_17(uint32_t value);
+bool phf_void_18(void);
+bool phf_set_19(uint32_t value);
+bool phf_void_20(void);
+bool phf_set_21(uint32_t value);
+bool phf_void_22(void);
+bool phf_set_23(uint32_t value);
+bool phf_void_24(void);
+bool phf_set_25(uint32_t value);
+bool phf_void_26(void);
+bool phf_set_27(uint32_t value);
+bool phf_void_28(void);
+bool phf_set_29(uint32_t value);
+bool phf_void_30(void);
+bool phf_set_31(uint32_t value);
+bool phf_void_32(void);
+bool phf_set_33(uint32_t value);
+bool phf_void_34(void);
+bool phf_set_35(uint32_t value);
+bool phf_void_36(void);
+bool phf_set_37(uint32_t value);
+bool phf_void_38(void);
+bool phf_set_39(uint32_t value);
+
+#ifdef __cplusplus
+}
+#endif
+
+#endif /* PHF_HANDLERS_H */
@@ -0,0 +1,95 @@
+/* SPDX-License-Identifier: Apache-2.0 */
+
+#include <gtest/gtest.h>
+#include <cstdio>
+
+extern "C" {
+#include "ce_dispatch.h"
+#include "ce_invoke_handler.h"
+#include "ce_table.h"
+#include "phf_handlers.h"
+}
+
+// -----------------------------------------------------------------------------
+// Mock Handlers
+// -----------------------------------------------------------------------------
+
+static const int kCommandCount = 40;
+
+static int g_last_id = -1;
+static uint32_t g_last_value = 0;
+static int g_calls = 0;
+
+static bool record_call(int id, uint32_t value) {
+    g_last_id = id;
+    g_last_value = value;
+    g_calls++;
+    return true;
+}
+
+#define PHF_VOID_HANDLER(n) \
+    extern "C" bool phf_void_##n(void) { return record_call(n, 0); }
+#define PHF_SET_HANDLER(n) \
+    extern "C" bool phf_set_##n(uint32_t value) { return record_call(n, value); }
+
+PHF_VOID_HANDLER(0)  PHF_SET_HANDLER(1)  PHF_VOID_HANDLER(2)  PHF_SET_HANDLER(3)
+PHF_VOID_HANDLER(4)  PHF_SET_HANDLER(5)  PHF_VOID_HANDLER(6)  PHF_SET_HANDLER(7)
+PHF_VOID_HANDLER(8)  PHF_SET_HANDLER(9)  PHF_VOID_HANDLER(10) PHF_SET_HANDLER(11)
+PHF_VOID_HANDLER(12) PHF_SET_HANDLER(13) PHF_VOID_HANDLER(14) PHF_SET_HANDLER(15)
+PHF_VOID_HANDLER(16) PHF_SET_HANDLER(17) PHF_VOID_HANDLER(18) PHF_SET_HANDLER(19)
+PHF_VOID_HANDLER(20) PHF_SET_HANDLER(21) PHF_VOID_HANDLER(22) PHF_SET_HANDLER(23)
+PHF_VOID_HANDLER(24) PHF_SET_HANDLER(25) PHF_VOID_HANDLER(26) PHF_SET_HANDLER(27)
+PHF_VOID_HANDLER(28) PHF_SET_HANDLER(29) PHF_VOID_HANDLER(30) PHF_SET_HANDLER(31)
+PHF_VOID_HANDLER(32) PHF_SET_HANDLER(33) PHF_VOID_HANDLER(34) PHF_SET_HANDLER(35)
+PHF_VOID_HANDLER(36) PHF_SET_HANDLER(37) PHF_VOID_HANDLER(38) PHF_SET_HANDLER(39)
+
+static void reset_mock_state() {
+    g_last_id = -1;
+    g_last_value = 0;
+    g_calls = 0;
+}
+
+// -----------------------------------------------------------------------------
+// Perfect-Hash Dispatch Tests
+// -----------------------------------------------------------------------------
+
+TEST(PhfDispatch, TableHoldsEveryCommand) {
+    EXPECT_EQ(ce_table_get_signatures_count(), (size_t)kCommandCount);
+}
+
+TEST(PhfDispatch, EveryCommandReachesItsHandler) {
+    for (int i = 0; i < kCommandCount; ++i) {
+        char line[32];
+        if (i % 2 == 0) {
+            snprintf(line, sizeof(line), "phf_void_%d", i);
+        } else {
+            snprintf(line, sizeof(line), "phf_set_%d %d", i, 1000 + i);
+        }
+
+        reset_mock_state();
+        EXPECT_TRUE(ce_dispatch_from_line(line)) << line;
+        EXPECT_EQ(g_calls, 1) << line;
+        EXPECT_EQ(g_last_id, i) << line;
+        EXPECT_EQ(g_last_value, (i % 2 == 0) ? 0u : (uint32_t)(1000 + i)) << line;
+    }
+}
+
+TEST(PhfDispatch, UnknownCommandHandled) {
+    reset_mock_state();
+    EXPECT_FALSE(ce_dispatch_from_line("phf_void_40"));
+    EXPECT_EQ(g_calls, 0);
+}
+
+TEST(PhfDispatch, UnknownHashReturnsFalse) {
+    reset_mock_state();
+    ce_signature_st sig = {
+        .hash_u32 = 0xDEADBEEF,  // Not in the perfect-hash table
+        .handler = (handler_func_t)phf_void_0,
+        .types_e = nullptr,
+        .type_count_u8 = 0
+    };
+
+    ce_arg_value_ut args[MAX_TOKENS] = {};
+    EXPECT_FALSE(ce_invoke_handler(&sig, args));
+    EXPECT_EQ(g_calls, 0);
+}
@@ -18,6 +18,19 @@ TEST(CeHashTest, EmptyString)
     EXPECT_EQ(ce_hash_calculate(""), 5381u);  // base value of DJB2
 }
 
+TEST(CeHashTest, NonAsciiBytesAreUnsigned)
+{
+    /* Must match utils.djb2_hash("ö") over the UTF-8 bytes C3 B6 */
+    EXPECT_EQ(ce_hash_calculate("\xC3\xB6"), ((5381u * 33u + 0xC3u) * 33u) + 0xB6u);
+}
+
+TEST(CeHashTest, MultiByteUtf8MatchesGenerator)
+{
+    /* Same vectors as test_djb2_hash_multibyte_regression in tools/tests/test_utils.py */
+    EXPECT_EQ(ce_hash_calculate("set_\xE2\x82\xAC"), 0x8C2CF4E0u);      // "set_€"
+    EXPECT_EQ(ce_hash_calculate("cmd_\xF0\x9F\x99\x82"), 0x9035C582u);  // "cmd_🙂"
+}
+
 TEST(CeHashTest, CaseSensitivity)
 {
     EXPECT_NE(ce_hash_calculate("Reset"), ce_hash_calculate("reset"));